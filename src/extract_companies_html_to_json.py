@@ -1,13 +1,52 @@
-from bs4 import BeautifulSoup
-from utils import remove_html_tags, row_with_most_non_nans, parse_arguments
+from utils import (
+    iter_code_texts,
+    loads,
+    compile_columns,
+    select_fields,
+    row_with_most_non_nans,
+    parse_arguments,
+)
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 import json, sys, time
 import pandas as pd
 
-# This value is used to extract the relevant JSON data from the HTML file.
-# LinkedIn may change this value in the future. There is no good way to automate this.
+# Those keys identify the <code> element holding the relevant JSON data in the HTML file.
+# LinkedIn leaves out keys without a value, so the element must contain "included"
+# and at least one of the optional company fields. LinkedIn may rename them in the future.
+RELEVANT_DATA_MARKERS = ['"included"']
+COMPANY_FIELD_MARKERS = [
+    '"websiteUrl"',
+    '"tagline"',
+    '"foundedOn"',
+    '"specialities"',
+    '"employeeCountRange"',
+]
+
+# The position of the <code> element that held the relevant JSON data so far.
+# It is used as a fallback if no element contains the markers above.
 ELEMENT_WITH_RELEVANT_DATA = 20
 
+# Columns of the DataFrame returned by `read_html_file`, mapped to the
+# dotted key path of the value in the JSON data.
+COLUMNS = {
+    "name": "name",
+    "tagline": "tagline",
+    "description": "description",
+    "websiteUrl": "websiteUrl",
+    "foundedOn": "foundedOn.year",
+    "headquarterCity": "headquarter.address.city",
+    "headquarterCountry": "headquarter.address.country",
+    "geographicArea": "headquarter.address.geographicArea",
+    "phone": "phone.number",
+    "specialities": "specialities",
+    "employeeCountRangeStart": "employeeCountRange.start",
+    "employeeCountRangeEnd": "employeeCountRange.end",
+}
+
+# Getters for the values of `COLUMNS`, compiled once at import.
+COLUMN_GETTERS = compile_columns(COLUMNS)
+
 
 def read_html_file(html_file_path: Path) -> pd.DataFrame:
     """
@@ -20,13 +59,12 @@ def read_html_file(html_file_path: Path) -> pd.DataFrame:
         pd.DataFrame: A DataFrame containing the extracted company information.
 
     Detailed Steps:
-    1. Read the contents of the HTML file using `read_text()` method.
-    2. Parse the HTML content using BeautifulSoup with the "html.parser" parser.
-    3. Find all the <code> elements in the parsed HTML content.
-    4. Remove the HTML tags from each <code> element using the `remove_html_tags` function.
-    5. Parse the JSON data from the relevant <code> element (determined by `ELEMENT_WITH_RELEVANT_DATA`).
-    6. Extract the relevant fields from the JSON data and create a new row DataFrame.
-    7. Concatenate the new row to the main DataFrame.
+    1. Stream the HTML file in binary mode.
+    2. Lazily extract the text of the <code> elements containing `RELEVANT_DATA_MARKERS` and one of
+       `COMPANY_FIELD_MARKERS` using `iter_code_texts`, falling back to `ELEMENT_WITH_RELEVANT_DATA`.
+    3. Parse the JSON data from the first candidate <code> element that holds valid JSON.
+    4. Collect the relevant fields (determined by `COLUMN_GETTERS`) into column lists.
+    5. Build the DataFrame from the column lists using `select_fields`.
 
     Example:
     >>> html_file_path = Path('company.html')
@@ -34,91 +72,56 @@ def read_html_file(html_file_path: Path) -> pd.DataFrame:
     >>> print(df.head())
     """
 
-    contents = html_file_path.read_text()
-    soup = BeautifulSoup(contents, "html.parser")
-    data = soup.findAll("code")
-
-    # remove code annotaion
-    raw_data = [remove_html_tags(str(d)) for d in data]
+    # Stop extracting as soon as one of the candidates holds valid JSON data
+    raw_data = iter_code_texts(
+        html_file_path,
+        RELEVANT_DATA_MARKERS,
+        any_markers=COMPANY_FIELD_MARKERS,
+        fallback_indices=[ELEMENT_WITH_RELEVANT_DATA],
+    )
 
-    try:
-        js = json.loads(raw_data[ELEMENT_WITH_RELEVANT_DATA])
-    except json.decoder.JSONDecodeError:
+    for text in raw_data:
+        try:
+            js = loads(text)
+        except json.decoder.JSONDecodeError:
+            continue
+        break
+    else:
+        # None of the candidates holds valid JSON data
         print("Error while parsing JSON data")
         sys.exit(1)
 
-    df = pd.DataFrame()
-
-    for lines in js["included"]:
-        # Extract relevant fields from the JSON data
-        name = lines.get("name")
-        tagline = lines.get("tagline")
-        description = lines.get("description")
-        founded_on_dict = lines.get("foundedOn", {})
-        founded_on = (
-            founded_on_dict.get("year") if founded_on_dict is not None else None
-        )
-        headquarter = lines.get("headquarter", {})
-        headquarter_address = (
-            headquarter.get("address", {}) if headquarter is not None else {}
-        )
-        headquarter_city = (
-            headquarter_address.get("city") if headquarter_address is not None else None
-        )
-        headquarter_country = (
-            headquarter_address.get("country")
-            if headquarter_address is not None
-            else None
-        )
-        geographic_area = (
-            headquarter_address.get("geographicArea")
-            if headquarter_address is not None
-            else None
-        )
-        website_url = lines.get("websiteUrl")
-        phone_dict = lines.get("phone", {})
-        phone = phone_dict.get("number") if phone_dict is not None else None
-        employee_count_range = lines.get("employeeCountRange", {})
-        employee_count_range_start = (
-            employee_count_range.get("start")
-            if employee_count_range is not None
-            else None
-        )
-        employee_count_range_end = (
-            employee_count_range.get("end")
-            if employee_count_range is not None
-            else None
-        )
-        specialities = lines.get("specialities")
-
-        # Create a new row DataFrame
-        new_row = {
-            "name": name,
-            "tagline": tagline,
-            "description": description,
-            "websiteUrl": website_url,
-            "foundedOn": founded_on,
-            "headquarterCity": headquarter_city,
-            "headquarterCountry": headquarter_country,
-            "geographicArea": geographic_area,
-            "phone": phone,
-            "specialities": specialities,
-            "employeeCountRangeStart": employee_count_range_start,
-            "employeeCountRangeEnd": employee_count_range_end,
-        }
-        row = pd.DataFrame([new_row])
-        # Concatenate the new row to the main DataFrame
-        df = pd.concat([df, row], ignore_index=True)
-
-    return df
+    # Collect the relevant fields column by column
+    return select_fields(js["included"], COLUMN_GETTERS)
+
+
+def process_html_file(html_file_path: Path) -> pd.DataFrame:
+    """
+    Extracts the most complete company row from a single HTML file.
+
+    This function is executed in a worker process by `get_all_information`.
+
+    Args:
+        html_file_path (Path): The path to the HTML file to be processed.
+
+    Returns:
+        pd.DataFrame: A single-row DataFrame with the most non-NaN values of the file.
+
+    Example:
+    >>> row = process_html_file(Path('company.html'))
+    """
+    print(f"Processing file: {html_file_path.name}")
+    df = read_html_file(html_file_path)
+    return row_with_most_non_nans(df)
 
 
 def get_all_information(directory_path: str) -> pd.DataFrame:
     """
     Aggregates data from all HTML files in a specified directory into a single DataFrame.
 
-    This function searches for all HTML files within the given directory, reads each file, drops any rows with NaN values,
-    and concatenates the resulting DataFrames into one combined DataFrame.
+    This function searches for all HTML files within the given directory, processes the files in parallel worker
+    processes, keeps the most complete row of each file and concatenates the resulting DataFrames into one combined
+    DataFrame.
 
     Parameters:
     - directory_path (str): The path to the directory containing the HTML files to be processed.
@@ -128,21 +131,24 @@ def get_all_information(directory_path: str) -> pd.DataFrame:
 
     Notes:
     - The function assumes that the HTML files have a structure that is compatible with `read_html_file` function.
-    - Ensure that the `get_all_files_in_folder` and `read_html_file` functions are defined and properly implemented to handle the file reading and data extraction.
+    - Each file is processed by `process_html_file` in a `ProcessPoolExecutor`, using all available cores.
 
     Example:
     >>> df = get_all_informations('/path/to/directory')
     >>> print(df.head())
     """
 
-    data = pd.DataFrame()
     directory_pathlib = Path(directory_path)
-    # Iterate over all HTML files in the specified directory
-    for file in directory_pathlib.rglob("*.html"):
-        print(f"Processing file: {file.name}")
-        df = read_html_file(file)
-        row = row_with_most_non_nans(df)
-        data = pd.concat([data, row], axis=1)
+    files = list(directory_pathlib.rglob("*.html"))
+
+    # Process all HTML files in the specified directory in parallel
+    with ProcessPoolExecutor() as executor:
+        results = list(executor.map(process_html_file, files))
+
+    if results:
+        data = pd.concat(results, ignore_index=True)
+    else:
+        data = pd.DataFrame(columns=list(COLUMNS))
 
     data.to_json(
         directory_pathlib.joinpath(f"{directory_pathlib.name}.json"),
@@ -1,15 +1,39 @@
-from bs4 import BeautifulSoup
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 import json
 import pandas as pd
-from utils import remove_html_tags, exclude_rows_with_x_nans, parse_arguments
+from utils import (
+    iter_code_texts,
+    loads,
+    compile_columns,
+    select_fields,
+    exclude_rows_with_x_nans,
+    parse_arguments,
+)
 import sys
 import time
 
-# Those values are used to extract the relevant JSON data from the HTML file.
-# LinkedIn may change those values in the future. There is no good way to automate this.
+# Those keys identify the <code> element holding the relevant JSON data in the HTML file.
+# LinkedIn may rename them in the future.
+RELEVANT_DATA_MARKERS = ['"included"', '"bserpEntityNavigationalUrl"']
+
+# The positions of the <code> elements that held the relevant JSON data so far.
+# They are used as a fallback if no element contains the markers above.
 ELEMENTS_WITH_RELEVANT_DATA = [14, 16]
 
+# Columns of the DataFrame returned by `read_html_file`, mapped to the
+# dotted key path of the value in the JSON data.
+COLUMNS = {
+    "name": "title.text",
+    "subtitle": "primarySubtitle.text",
+    "position": "summary.text",
+    "linkedinUrl": "bserpEntityNavigationalUrl",
+}
+
+# Getters for the values of `COLUMNS`, compiled once at import.
+COLUMN_GETTERS = compile_columns(COLUMNS)
+
 
 def read_html_file(html_file_path: Path) -> pd.DataFrame:
     """
@@ -22,63 +46,70 @@ def read_html_file(html_file_path: Path) -> pd.DataFrame:
         pd.DataFrame: A DataFrame containing the extracted person information.
 
     Detailed Steps:
-    1. Read the contents of the HTML file.
-    2. Parse the HTML content using BeautifulSoup.
-    3. Extract the JSON data from the HTML file.
-    4. Initialize an empty DataFrame.
-    5. Iterate over the JSON data and extract the relevant fields.
-    6. Create a new row DataFrame.
-    7. Concatenate the new row to the main DataFrame.
+    1. Stream the HTML file in binary mode.
+    2. Lazily extract the text of the <code> elements containing all `RELEVANT_DATA_MARKERS` using
+       `iter_code_texts`, falling back to `ELEMENTS_WITH_RELEVANT_DATA`.
+    3. Extract the JSON data from the first candidate <code> element that holds valid JSON.
+    4. Collect the relevant fields (determined by `COLUMN_GETTERS`) into column lists.
+    5. Build the DataFrame from the column lists using `select_fields`.
 
     Example:
     >>> html_file_path = Path('data/file.html')
     >>> read_html_file(html_file_path
     """
 
-    contents = Path(html_file_path).read_text()
-    soup = BeautifulSoup(contents, "html.parser")
-    data = soup.findAll("code")
+    # Stop extracting as soon as one of the candidates holds valid JSON data
+    raw_data = iter_code_texts(
+        Path(html_file_path),
+        RELEVANT_DATA_MARKERS,
+        fallback_indices=ELEMENTS_WITH_RELEVANT_DATA,
+    )
 
-    # remove code annotaion
-    raw_data = [remove_html_tags(str(d)) for d in data]
-
-    for element in ELEMENTS_WITH_RELEVANT_DATA:
+    for text in raw_data:
         try:
-            js = json.loads(raw_data[element])
+            js = loads(text)
         except json.decoder.JSONDecodeError:
             continue
         break
-
-    # Check if the JSON data is loaded correctly
-    if "js" not in locals():
+    else:
+        # None of the candidates holds valid JSON data
         print("Error while parsing JSON data")
         sys.exit(1)
 
-    # Initialize an empty DataFrame
-    df = pd.DataFrame()
-
-    for lines in js["included"]:
-        # Extract relevant fields from the JSON data
-        title_dict = lines.get("title", {})
-        title = title_dict.get("text") if title_dict is not None else None
-        subtitle_dict = lines.get("primarySubtitle", {})
-        subtitle = subtitle_dict.get("text") if subtitle_dict is not None else None
-        position_dict = lines.get("summary", {})
-        position = position_dict.get("text") if position_dict is not None else None
-        linkedin_url = lines.get("bserpEntityNavigationalUrl")
-
-        # Create a new row DataFrame
-        new_row = {
-            "name": title,
-            "subtitle": subtitle,
-            "position": position,
-            "linkedinUrl": linkedin_url,
-        }
-        row = pd.DataFrame([new_row])
-        # Concatenate the new row to the main DataFrame
-        df = pd.concat([df, row], ignore_index=True)
-
-    return df
+    # Collect the relevant fields column by column
+    return select_fields(js["included"], COLUMN_GETTERS)
+
+
+def process_html_file(html_file_path: Path, output_directory: Path) -> None:
+    """
+    Extracts person information from a single HTML file and saves it to JSON.
+
+    This function is executed in a worker process by `get_all_information`.
+
+    Args:
+        html_file_path (Path): The path to the HTML file.
+        output_directory (Path): The directory the JSON file is saved to.
+
+    Returns:
+        None
+
+    Detailed Steps:
+    1. Read the HTML file using the `read_html_file` function.
+    2. Exclude rows with more than 2 NaN values using the `exclude_rows_with_x_nans` function.
+    3. Save the extracted information to a JSON file with the same name as the HTML file.
+
+    Example:
+    >>> process_html_file(Path('data/file.html'), Path('data'))
+    """
+    print(f"Processing file: {html_file_path.name}")
+    df = read_html_file(html_file_path)
+    rows = exclude_rows_with_x_nans(df, 2)
+
+    rows.to_json(
+        output_directory.joinpath(f"{html_file_path.stem}.json"),
+        orient="records",
+        force_ascii=False,
+    )
 
 
 def get_all_information(directory_path: Path) -> None:
@@ -92,10 +123,8 @@ def get_all_information(directory_path: Path) -> None:
         None
 
     Detailed Steps:
-    1. Iterate over all the files in the specified directory.
-    2. Read the HTML file using the `read_html_file` function.
-    3. Exclude rows with more than 2 NaN values using the `exclude_rows_with_x_nans` function.
-    4. Save the extracted information to a JSON file with the same name as the HTML file.
+    1. Collect all the HTML files in the specified directory.
+    2. Process the files in parallel worker processes using the `process_html_file` function.
 
     Example:
     >>> directory_path = Path('data')
@@ -103,17 +132,11 @@ def get_all_information(directory_path: Path) -> None:
     """
 
     directory_pathlib = Path(directory_path)
+    files = list(directory_pathlib.rglob("*.html"))
 
-    for file in directory_pathlib.rglob("*.html"):
-        print(f"Processing file: {file.name}")
-        df = read_html_file(file)
-        rows = exclude_rows_with_x_nans(df, 2)
-
-        rows.to_json(
-            directory_pathlib.joinpath(f"{file.stem}.json"),
-            orient="records",
-            force_ascii=False,
-        )
+    # Process all HTML files in the specified directory in parallel
+    with ProcessPoolExecutor() as executor:
+        list(executor.map(process_html_file, files, repeat(directory_pathlib)))
 
 
 if __name__ == "__main__":
@@ -1,12 +1,27 @@
 from lxml import etree
+from pathlib import Path
+from typing import Callable, Iterator
 import pandas as pd
 import argparse
+import io
+import orjson
+import warnings
+
+# Stand-in for null intermediate values when following a key path.
+_EMPTY = {}
+
+# Shared parser for `remove_html_tags`. lxml parsers are not thread-safe, which is fine
+# as long as the files are processed in separate worker processes.
+_PARSER = etree.HTMLParser()
 
 
 def remove_html_tags(text: str) -> str:
     """
     Removes HTML tags from a given string of text.
 
+    Deprecated: use `iter_code_texts` to extract the text of <code> elements
+    directly from the HTML file.
+
     Args:
         text (str): The input string containing HTML content.
 
@@ -14,9 +29,9 @@ def remove_html_tags(text: str) -> str:
         str: The text with all HTML tags removed, leaving only the plain text content.
 
     Detailed Steps:
-    1. Create an HTML parser using `etree.HTMLParser()`.
+    1. Reuse the module-level HTML parser instead of creating a new one per call.
     2. Parse the input HTML string into an element tree using `etree.fromstring()`.
-    3. Convert the element tree back to a string, extracting only the text content and ignoring the HTML tags.
+    3. Join the text nodes of the element tree, ignoring the HTML tags.
 
     Example:
     >>> html_text = '<p>Hello, <b>world</b>!</p>'
@@ -24,9 +39,170 @@ def remove_html_tags(text: str) -> str:
     >>> print(clean_text)
     'Hello, world!'
     """
-    parser = etree.HTMLParser()
-    tree = etree.fromstring(text, parser)
-    return etree.tostring(tree, encoding="unicode", method="text")
+    warnings.warn(
+        "remove_html_tags is deprecated, use iter_code_texts instead",
+        DeprecationWarning,
+        stacklevel=2,
+    )
+    tree = etree.fromstring(text, _PARSER)
+    return "".join(tree.itertext())
+
+
+def iter_code_texts(
+    source: Path | bytes,
+    markers: list[str],
+    any_markers: list[str] = (),
+    fallback_indices: list[int] = (),
+) -> Iterator[str]:
+    """
+    Lazily yields the text content of the <code> elements containing the given markers.
+
+    Args:
+        source (Path | bytes): The path to the HTML file, or the raw HTML document.
+        markers (list[str]): The substrings a <code> element's text must all contain to be yielded.
+        any_markers (list[str]): If given, the text must also contain at least one of these substrings.
+        fallback_indices (list[int]): The zero-based positions of the <code> elements to yield
+            after all matching elements, e.g. the positions LinkedIn used to place the data at.
+
+    Yields:
+        str: The text of each matching <code> element in document order, followed by the
+        text of the fallback elements that did not match.
+
+    Detailed Steps:
+    1. Open the HTML file in binary mode, so the parser reads it in chunks and detects the encoding itself.
+    2. Stream the content through `etree.iterparse()`, only reporting <code> elements.
+    3. Yield the text of every <code> element that contains the markers.
+    4. Keep the text of the non-matching <code> elements at a fallback position.
+    5. Clear every <code> element once it has been seen to keep the tree small.
+    6. Yield the kept fallback texts once the document has been read completely.
+    7. Stop reading as soon as the caller stops iterating.
+
+    Example:
+    >>> code = b'<p><code>{"a": 1}</code><code>{"b": 2}</code></p>'
+    >>> next(iter_code_texts(code, ['"b"']))
+    '{"b": 2}'
+    >>> list(iter_code_texts(code, ['"c"'], fallback_indices=[0]))
+    ['{"a": 1}']
+    """
+    fallbacks = {}
+    with io.BytesIO(source) if isinstance(source, bytes) else open(source, "rb") as f:
+        events = etree.iterparse(f, events=("end",), tag="code", html=True)
+        for i, (_, elem) in enumerate(events):
+            text = "".join(elem.itertext())
+            elem.clear()
+            if all(marker in text for marker in markers) and (
+                not any_markers or any(marker in text for marker in any_markers)
+            ):
+                yield text
+            elif i in fallback_indices:
+                fallbacks[i] = text
+
+    for i in fallback_indices:
+        if i in fallbacks:
+            yield fallbacks[i]
+
+
+def loads(data: bytes | str) -> object:
+    """
+    Deserializes a JSON document using orjson.
+
+    Args:
+        data (bytes | str): The JSON document.
+
+    Returns:
+        object: The deserialized Python object.
+
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON.
+        `orjson.JSONDecodeError` is a subclass of it.
+
+    Example:
+    >>> loads('{"included": []}')
+    {'included': []}
+    """
+    return orjson.loads(data)
+
+
+def compile_columns(columns: dict[str, str]) -> dict[str, Callable[[dict], object]]:
+    """
+    Compiles the key paths of a column table into getters for JSON records.
+
+    Args:
+        columns (dict[str, str]): The column names, mapped to the dotted key path of their value.
+
+    Returns:
+        dict[str, Callable[[dict], object]]: The column names, mapped to the getter of their value.
+
+    Detailed Steps:
+    1. Split every key path into its keys.
+    2. Turn each key path of up to three keys into a single straight-line `.get()` chain,
+       so no Python-level loop over the keys is needed for every record.
+
+    Example:
+    >>> getters = compile_columns({'name': 'title.text'})
+    >>> getters['name']({'title': {'text': 'A'}})
+    'A'
+    """
+    return {column: _compile_path(path) for column, path in columns.items()}
+
+
+def _compile_path(path: str) -> Callable[[dict], object]:
+    """
+    Compiles a dotted key path into a getter for a JSON record.
+
+    Key paths of up to three keys, which covers every path in use, become a single
+    straight-line `.get()` chain. Longer key paths walk the same chain in a loop.
+    """
+    keys = path.split(".")
+    if len(keys) == 1:
+        (a,) = keys
+        return lambda record: record.get(a)
+    if len(keys) == 2:
+        a, b = keys
+        return lambda record: (record.get(a) or _EMPTY).get(b)
+    if len(keys) == 3:
+        a, b, c = keys
+        return lambda record: ((record.get(a) or _EMPTY).get(b) or _EMPTY).get(c)
+    return lambda record: _get_path(record, keys)
+
+
+def _get_path(record: dict, keys: list[str]) -> object:
+    """Follows a key path like the compiled `.get()` chains, for paths of any length."""
+    *parents, last = keys
+    for key in parents:
+        record = record.get(key) or _EMPTY
+    return record.get(last)
+
+
+def select_fields(
+    records: list[dict], getters: dict[str, Callable[[dict], object]]
+) -> pd.DataFrame:
+    """
+    Builds a DataFrame from selected (nested) fields of a list of JSON records.
+
+    Args:
+        records (list[dict]): The JSON records.
+        getters (dict[str, Callable[[dict], object]]): The column names, mapped to the getter
+            of their value, as returned by `compile_columns`.
+
+    Returns:
+        pd.DataFrame: A DataFrame with one row per record and the given columns.
+        Missing keys and null intermediate values result in None.
+
+    Detailed Steps:
+    1. Apply each getter to every record, collecting the values of one column in a list.
+    2. Build the DataFrame directly from the column lists, without dtype inference.
+
+    Example:
+    >>> records = [{'title': {'text': 'A'}}, {'title': None}]
+    >>> select_fields(records, compile_columns({'name': 'title.text'}))
+       name
+    0     A
+    1  None
+    """
+    data = {column: list(map(getter, records)) for column, getter in getters.items()}
+    # Keep the values as they are, so whole numbers are not cast to float by NaN rows
+    return pd.DataFrame(data, columns=list(getters), dtype=object, copy=False)
 
 
 def row_with_most_non_nans(df: pd.DataFrame) -> pd.DataFrame:
@@ -44,10 +220,8 @@ def row_with_most_non_nans(df: pd.DataFrame) -> pd.DataFrame:
     >>> row = row_with_most_non_nans(df)
 
     """
-    non_nan_counts = df.notna().sum(axis=1)
-    max_index = non_nan_counts.idxmax()
-    row = df.loc[max_index]
-    return pd.DataFrame([row])
+    non_nan_counts = df.count(axis=1).to_numpy()
+    return df.iloc[[non_nan_counts.argmax()]]
 
 
 def exclude_rows_with_x_nans(df: pd.DataFrame, x: int) -> pd.DataFrame: